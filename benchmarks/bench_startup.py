@@ -0,0 +1,77 @@
+"""Benchmark cold start-up of the ETL entry point.
+
+Run from the repository root:
+
+    python benchmarks/bench_startup.py --runs 10
+
+Each run executes ``src/main.py --pipeline store`` in a fresh interpreter,
+from a scratch directory holding a copy of ``config/``, so nothing is served
+from a warm ``sys.modules`` and no repository logs are touched. The report
+also lists which heavy modules ended up imported, which should be none for
+a pipeline that touches no source.
+"""
+import os
+import sys
+import json
+import shutil
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAIN_PATH = os.path.join(REPO_ROOT, 'src', 'main.py')
+HEAVY_MODULES = ['pandas', 'numpy', 'pymongo', 'requests', 'sqlalchemy', 'psycopg2']
+
+STARTUP_SNIPPET = """
+import json, runpy, sys, time
+start = time.perf_counter()
+sys.argv = [%(main)r] + %(args)r
+exit_code = 0
+try:
+    runpy.run_path(%(main)r, run_name='__main__')
+except SystemExit as e:
+    exit_code = e.code or 0
+print(json.dumps({
+    'startup_ms': (time.perf_counter() - start) * 1000,
+    'exit_code': exit_code,
+    'heavy_modules': [m for m in %(heavy)r if m in sys.modules],
+}))
+"""
+
+def make_workdir():
+    """Create a scratch working directory with the configuration main.py reads"""
+    workdir = tempfile.mkdtemp(prefix='etl_startup_')
+    shutil.copytree(os.path.join(REPO_ROOT, 'config'), os.path.join(workdir, 'config'))
+    os.makedirs(os.path.join(workdir, 'logs'))
+    return workdir
+
+def run_once(workdir, args):
+    """Time a single cold start of main.py in a fresh interpreter"""
+    snippet = STARTUP_SNIPPET % {'main': MAIN_PATH, 'args': args, 'heavy': HEAVY_MODULES}
+    output = subprocess.run(
+        [sys.executable, '-c', snippet],
+        cwd=workdir, check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description='ETL start-up benchmark')
+    parser.add_argument('--runs', type=int, default=5, help='Number of cold starts')
+    parser.add_argument('--pipeline', default='store', help='Pipeline passed to main.py')
+    args = parser.parse_args()
+
+    workdir = make_workdir()
+    try:
+        results = [run_once(workdir, ['--pipeline', args.pipeline]) for _ in range(args.runs)]
+    finally:
+        shutil.rmtree(workdir)
+    startup_ms = [r['startup_ms'] for r in results]
+
+    print(f"runs:            {args.runs}")
+    print(f"startup median:  {statistics.median(startup_ms):.1f} ms")
+    print(f"exit codes:      {sorted({r['exit_code'] for r in results})}")
+    print(f"heavy modules:   {results[-1]['heavy_modules'] or 'none'}")
+
+if __name__ == '__main__':
+    main()
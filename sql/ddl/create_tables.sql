@@ -94,3 +94,9 @@ CREATE TABLE fact_inventory (
     created_timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
+-- ETL Metadata
+CREATE TABLE IF NOT EXISTS etl_watermark (
+    table_name VARCHAR(100) PRIMARY KEY,
+    last_loaded_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    rows_loaded INTEGER
+);
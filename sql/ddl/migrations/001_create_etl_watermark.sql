@@ -0,0 +1,7 @@
+-- Adds the load watermark table to warehouses created before it existed.
+-- Safe to run repeatedly.
+CREATE TABLE IF NOT EXISTS etl_watermark (
+    table_name VARCHAR(100) PRIMARY KEY,
+    last_loaded_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    rows_loaded INTEGER
+);
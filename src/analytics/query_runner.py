@@ -0,0 +1,183 @@
+import os
+import re
+import json
+import hashlib
+import logging
+from datetime import date
+from typing import Dict, List, Optional
+import pandas as pd
+from sqlalchemy import text, bindparam
+from ..utils.database import DatabaseConnection
+
+logger = logging.getLogger(__name__)
+
+TABLE_PATTERN = re.compile(r'\b(?:FROM|JOIN)\s+((?:dim|fact)_\w+)', re.IGNORECASE)
+PARAM_PATTERN = re.compile(r'%\((\w+)\)s')
+CLOCK_PATTERN = re.compile(r'\b(?:CURRENT_DATE|CURRENT_TIMESTAMP|CURRENT_TIME|LOCALTIMESTAMP|LOCALTIME|NOW\s*\()',
+                           re.IGNORECASE)
+
+class AnalyticsQueryRunner:
+    """Runs the analytics reports and caches their results keyed on table watermarks"""
+
+    def __init__(self, db_connection: DatabaseConnection):
+        self.db_conn = db_connection
+        analytics_config = self.db_conn.config['analytics']
+        self.sql_dir = analytics_config.get('sql_dir', 'sql/analytics')
+        self.cache_dir = analytics_config.get('cache_dir', 'cache/analytics')
+        self.max_cache_bytes = int(analytics_config.get('max_cache_mb', 512)) * 1024 * 1024
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def run_report(self, report_name: str, params: Dict = None, use_cache: bool = True) -> pd.DataFrame:
+        """Run an analytics report, serving the cached result while its watermarks are unchanged"""
+        try:
+            sql = self._read_report(report_name)
+            query_params = self._bind_params(sql, params)
+            query_hash = self._hash({'sql': sql, 'params': query_params})
+            watermark_hash = self._hash(self.get_cache_version(sql))
+            cache_path = os.path.join(self.cache_dir, f"{query_hash}-{watermark_hash}.parquet")
+
+            if use_cache:
+                cached = self._read_cached(cache_path)
+                if cached is not None:
+                    logger.info(f"Serving {report_name} from cache")
+                    return cached
+
+            engine = self.db_conn.get_sqlalchemy_engine()
+            df = pd.read_sql(sql, engine, params=query_params or None)
+            logger.info(f"Executed {report_name} returning {len(df)} rows")
+
+            self._remove_stale_entries(query_hash)
+            self._write_cached(df, cache_path)
+            self._evict()
+            return df
+        except Exception as e:
+            logger.error(f"Error running report {report_name}: {str(e)}")
+            raise
+
+    def get_source_tables(self, sql: str) -> List[str]:
+        """Return the warehouse tables a query reads from"""
+        return sorted({table.lower() for table in TABLE_PATTERN.findall(sql)})
+
+    def get_cache_version(self, sql: str) -> Dict:
+        """Return what a cached result of the query depends on besides its text and parameters
+
+        That is the watermarks of the tables it reads, plus today's date for
+        reports that compare against CURRENT_DATE or NOW().
+        """
+        version = dict(self.get_watermarks(self.get_source_tables(sql)))
+        if CLOCK_PATTERN.search(sql):
+            version['current_date'] = self._today()
+        return version
+
+    def _today(self) -> str:
+        return date.today().isoformat()
+
+    def get_watermarks(self, tables: List[str]) -> Dict:
+        """Return the latest load watermark of each table, None if never loaded"""
+        watermarks = {table: None for table in tables}
+        if not tables:
+            return watermarks
+
+        # Read through a pooled engine connection, which is rolled back on release,
+        # so a long-lived dashboard process never sits idle in transaction
+        query = text(
+            "SELECT table_name, last_loaded_at FROM etl_watermark WHERE table_name IN :tables"
+        ).bindparams(bindparam('tables', expanding=True))
+        engine = self.db_conn.get_sqlalchemy_engine()
+        with engine.connect() as conn:
+            for table_name, last_loaded_at in conn.execute(query, {'tables': tables}):
+                watermarks[table_name] = last_loaded_at.isoformat()
+        return watermarks
+
+    def clear_cache(self) -> None:
+        """Remove all cached report results"""
+        for entry in self._cache_entries():
+            self._remove_entry(entry)
+
+    def _read_report(self, report_name: str) -> str:
+        """Read the SQL of a report, preferring its parameterised variant under params/
+
+        The top-level reports stay plain SQL so they can still be run by hand.
+        """
+        path = os.path.join(self.sql_dir, 'params', f"{report_name}.sql")
+        if not os.path.exists(path):
+            path = os.path.join(self.sql_dir, f"{report_name}.sql")
+        with open(path) as f:
+            return f.read()
+
+    def _read_cached(self, cache_path: str) -> Optional[pd.DataFrame]:
+        """Read a cached result, or None when it is missing or unreadable
+
+        Entries can be evicted by another process between lookup and read;
+        an unreadable entry is dropped so the query is executed again.
+        """
+        try:
+            df = pd.read_parquet(cache_path)
+            os.utime(cache_path)
+            return df
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Dropping unreadable cached result {os.path.basename(cache_path)}: {str(e)}")
+            self._remove_entry(cache_path)
+            return None
+
+    def _write_cached(self, df: pd.DataFrame, cache_path: str) -> None:
+        """Write a result atomically so concurrent readers never see a partial file"""
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        try:
+            df.to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, cache_path)
+        finally:
+            self._remove_entry(tmp_path)
+
+    def _remove_entry(self, path: str) -> None:
+        """Remove a cache file that another process may already have removed"""
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def _bind_params(self, sql: str, params: Optional[Dict]) -> Dict:
+        """Fill every placeholder of the report, leaving unset filters as NULL"""
+        params = params or {}
+        unknown = set(params) - set(PARAM_PATTERN.findall(sql))
+        if unknown:
+            raise ValueError(f"Unknown report parameters: {unknown}")
+        return {name: params.get(name) for name in sorted(set(PARAM_PATTERN.findall(sql)))}
+
+    def _hash(self, value) -> str:
+        """Stable short hash of a JSON-serialisable value"""
+        payload = json.dumps(value, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+    def _cache_entries(self) -> List[str]:
+        """List cached result files"""
+        return [
+            os.path.join(self.cache_dir, name)
+            for name in os.listdir(self.cache_dir)
+            if name.endswith('.parquet')
+        ]
+
+    def _remove_stale_entries(self, query_hash: str) -> None:
+        """Drop results of the same query cached under older watermarks"""
+        for entry in self._cache_entries():
+            if os.path.basename(entry).startswith(f"{query_hash}-"):
+                self._remove_entry(entry)
+
+    def _evict(self) -> None:
+        """Evict least recently used results until the cache fits its size limit"""
+        entries = []
+        for entry in self._cache_entries():
+            try:
+                stat = os.stat(entry)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry))
+        entries.sort()
+        total_size = sum(size for _, size, _ in entries)
+        while entries and total_size > self.max_cache_bytes:
+            _, size, entry = entries.pop(0)
+            total_size -= size
+            self._remove_entry(entry)
+            logger.info(f"Evicted cached result {os.path.basename(entry)}")
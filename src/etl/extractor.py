@@ -2,6 +2,7 @@ import logging
 from typing import Dict, List, Any
 import pandas as pd
 from ..utils.database import DatabaseConnection
+from ..utils.profiling import profiled
 
 logger = logging.getLogger(__name__)
 
@@ -9,6 +10,7 @@ class DataExtractor:
     def __init__(self, db_connection: DatabaseConnection):
         self.db_conn = db_connection
         
+    @profiled
     def extract_from_mongodb(self, collection: str, query: Dict = None) -> pd.DataFrame:
         """Extract data from MongoDB collection"""
         try:
@@ -19,6 +21,7 @@ class DataExtractor:
             logger.error(f"Error extracting from MongoDB: {str(e)}")
             raise
             
+    @profiled
     def extract_from_api(self, endpoint: str, params: Dict = None) -> pd.DataFrame:
         """Extract data from REST API"""
         try:
@@ -1,26 +1,57 @@
 import pandas as pd
 from typing import List
 import logging
+from sqlalchemy import text
 from ..utils.database import DatabaseConnection
+from ..utils.profiling import profiled
 
 logger = logging.getLogger(__name__)
 
+WATERMARK_DDL = """
+CREATE TABLE IF NOT EXISTS etl_watermark (
+    table_name VARCHAR(100) PRIMARY KEY,
+    last_loaded_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    rows_loaded INTEGER
+)
+"""
+
 class DataLoader:
     def __init__(self, db_connection: DatabaseConnection):
         self.db_conn = db_connection
+        self._watermark_ready = False
     
+    @profiled
     def load_to_warehouse(self, df: pd.DataFrame, table_name: str, if_exists: str = 'append') -> None:
-        """Load DataFrame to data warehouse"""
+        """Load DataFrame to data warehouse, advancing its watermark in the same transaction"""
         try:
             engine = self.db_conn.get_sqlalchemy_engine()
-            df.to_sql(
-                name=table_name,
-                con=engine,
-                if_exists=if_exists,
-                index=False,
-                chunksize=1000
-            )
+            with engine.begin() as conn:
+                df.to_sql(
+                    name=table_name,
+                    con=conn,
+                    if_exists=if_exists,
+                    index=False,
+                    chunksize=1000
+                )
+                self.update_watermark(conn, table_name, len(df))
+            # Transactional DDL: only trust the table once the load has committed
+            self._watermark_ready = True
             logger.info(f"Successfully loaded {len(df)} rows to {table_name}")
         except Exception as e:
             logger.error(f"Error loading data to warehouse: {str(e)}")
-            raise
\ No newline at end of file
+            raise
+
+    def update_watermark(self, conn, table_name: str, rows_loaded: int) -> None:
+        """Advance the load watermark of a table so cached analytics are invalidated"""
+        if not self._watermark_ready:
+            conn.execute(text(WATERMARK_DDL))
+        conn.execute(
+            text("""
+            INSERT INTO etl_watermark (table_name, last_loaded_at, rows_loaded)
+            VALUES (:table_name, CURRENT_TIMESTAMP, :rows_loaded)
+            ON CONFLICT (table_name) DO UPDATE
+            SET last_loaded_at = EXCLUDED.last_loaded_at,
+                rows_loaded = EXCLUDED.rows_loaded
+            """),
+            {'table_name': table_name, 'rows_loaded': rows_loaded}
+        )
@@ -1,8 +1,5 @@
 import logging
 from typing import Dict, List
-from .extractors import DataExtractor
-from .transformers import DataTransformer
-from .loaders import DataLoader
 from ..utils.database import DatabaseConnection
 
 logger = logging.getLogger(__name__)
@@ -10,10 +7,56 @@ logger = logging.getLogger(__name__)
 class ETLPipeline:
     def __init__(self, config_path: str = 'config/database.ini'):
         self.db_conn = DatabaseConnection(config_path)
-        self.extractor = DataExtractor(self.db_conn)
-        self.transformer = DataTransformer()
-        self.loader = DataLoader(self.db_conn)
+        self._extractor = None
+        self._transformer = None
+        self._loader = None
+        self._quality_checker = None
+
+    # Stages are built on first use so that pandas and the source drivers
+    # are only imported by the pipelines that actually need them
+    @property
+    def extractor(self):
+        """Data extractor, created on first use"""
+        if self._extractor is None:
+            from .extractor import DataExtractor
+            self._extractor = DataExtractor(self.db_conn)
+        return self._extractor
+
+    @property
+    def transformer(self):
+        """Data transformer, created on first use"""
+        if self._transformer is None:
+            from .transformers import DataTransformer
+            self._transformer = DataTransformer()
+        return self._transformer
+
+    @property
+    def loader(self):
+        """Warehouse loader, created on first use"""
+        if self._loader is None:
+            from .loaders import DataLoader
+            self._loader = DataLoader(self.db_conn)
+        return self._loader
+
+    @property
+    def quality_checker(self):
+        """Data quality checker, created on first use"""
+        if self._quality_checker is None:
+            from ..quality.checks import DataQualityChecker
+            self._quality_checker = DataQualityChecker(self.db_conn)
+        return self._quality_checker
+
+    def close(self):
+        """Close any connections opened by the pipeline stages"""
+        self.db_conn.close_connections()
     
+    def _update_profile(self, df, table_name: str, key_column: str) -> None:
+        """Update the table profile without failing a load that has already committed"""
+        try:
+            self.quality_checker.update_profile(df, table_name, key_column=key_column)
+        except Exception as e:
+            logger.error(f"Error updating profile of {table_name}, load was kept: {str(e)}")
+
     def run_customer_pipeline(self):
         """Run ETL pipeline for customer data"""
         try:
@@ -26,6 +69,9 @@ class ETLPipeline:
             # Load
             self.loader.load_to_warehouse(transformed_data, 'dim_customer')
             
+            # Profile the loaded rows for the next run's duplicate and drift checks
+            self._update_profile(transformed_data, 'dim_customer', 'customer_id')
+            
             logger.info("Customer pipeline completed successfully")
         except Exception as e:
             logger.error(f"Error in customer pipeline: {str(e)}")
@@ -43,6 +89,9 @@ class ETLPipeline:
             # Load
             self.loader.load_to_warehouse(transformed_data, 'fact_sales')
             
+            # Profile the loaded rows for the next run's duplicate and drift checks
+            self._update_profile(transformed_data, 'fact_sales', 'transaction_key')
+            
             logger.info("Sales pipeline completed successfully")
         except Exception as e:
             logger.error(f"Error in sales pipeline: {str(e)}")
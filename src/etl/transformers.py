@@ -2,11 +2,13 @@ import pandas as pd
 import numpy as np
 from typing import Dict, List
 import logging
+from ..utils.profiling import profiled
 
 logger = logging.getLogger(__name__)
 
 class DataTransformer:
     @staticmethod
+    @profiled
     def clean_customer_data(df: pd.DataFrame) -> pd.DataFrame:
         """Clean and transform customer data"""
         try:
@@ -29,6 +31,7 @@ class DataTransformer:
             raise
     
     @staticmethod
+    @profiled
     def transform_sales_data(df: pd.DataFrame) -> pd.DataFrame:
         """Transform sales data"""
         try:
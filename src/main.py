@@ -4,9 +4,14 @@ import logging
 import logging.config
 import argparse
 from datetime import datetime
-from etl.pipeline import ETLPipeline
-from quality.checks import DataQualityChecker
-from utils.database import DatabaseConnection
+
+# Allow `python src/main.py` as well as `python -m src.main`: the pipeline
+# modules use package-relative imports, so they must load as part of `src`
+if __package__ in (None, ''):
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.etl.pipeline import ETLPipeline
+from src.utils.profiling import PROFILERS, enable_profiling
 
 def setup_logging():
     """Setup logging configuration"""
@@ -20,6 +25,8 @@ def parse_arguments():
                        default='all', help='Pipeline to run')
     parser.add_argument('--mode', choices=['full', 'incremental'],
                        default='incremental', help='Load mode')
+    parser.add_argument('--profile', nargs='?', const='cprofile', choices=PROFILERS,
+                       help='Profile time and memory of each stage, writing reports to logs/profile')
     return parser.parse_args()
 
 def main():
@@ -27,14 +34,15 @@ def main():
     # Setup logging
     logger = setup_logging()
     logger.info("Starting Retail Data Warehouse ETL process")
+    pipeline = None
     
     try:
         args = parse_arguments()
+        if args.profile:
+            enable_profiling('logs/profile', profiler=args.profile)
         
-        # Initialize pipeline
+        # Initialize pipeline; stages and connections are opened on first use
         pipeline = ETLPipeline()
-        db_conn = DatabaseConnection()
-        quality_checker = DataQualityChecker(db_conn)
         
         # Run selected pipeline
         if args.pipeline in ['all', 'customer']:
@@ -61,7 +69,8 @@ def main():
     finally:
         # Cleanup connections
         try:
-            db_conn.close_connections()
+            if pipeline:
+                pipeline.close()
         except:
             pass
 
@@ -1,15 +1,23 @@
 import pandas as pd
 import numpy as np
 from typing import Dict, List, Tuple
+import os
 import logging
 from ..utils.database import DatabaseConnection
+from ..utils.profiling import profiled
+from .sketches import TableProfile, hash_values
 
 logger = logging.getLogger(__name__)
 
 class DataQualityChecker:
-    def __init__(self, db_connection: DatabaseConnection):
+    def __init__(self, db_connection: DatabaseConnection, profile_dir: str = 'profiles',
+                 chunk_size: int = 100000, key_capacity: int = 1000000):
         self.db_conn = db_connection
+        self.profile_dir = profile_dir
+        self.chunk_size = chunk_size
+        self.key_capacity = key_capacity
     
+    @profiled
     def check_null_values(self, df: pd.DataFrame, required_columns: List[str]) -> Tuple[bool, Dict]:
         """Check for null values in required columns"""
         results = {}
@@ -30,6 +38,7 @@ class DataQualityChecker:
         
         return passed, results
     
+    @profiled
     def check_duplicates(self, df: pd.DataFrame, unique_columns: List[str]) -> Tuple[bool, Dict]:
         """Check for duplicate records based on specified columns"""
         duplicates = df[df.duplicated(subset=unique_columns, keep=False)]
@@ -46,6 +55,7 @@ class DataQualityChecker:
         
         return passed, results
     
+    @profiled
     def check_value_ranges(self, df: pd.DataFrame, range_checks: Dict) -> Tuple[bool, Dict]:
         """Check if values fall within expected ranges"""
         results = {}
@@ -71,6 +81,7 @@ class DataQualityChecker:
         
         return passed, results
     
+    @profiled
     def check_referential_integrity(self, table_name: str, foreign_key: str, 
                                   ref_table: str, ref_key: str) -> Tuple[bool, Dict]:
         """Check referential integrity between tables"""
@@ -105,6 +116,128 @@ class DataQualityChecker:
         except Exception as e:
             logger.error(f"Error checking referential integrity: {str(e)}")
             raise
+
+    def get_profile(self, table_name: str, key_column: str = None) -> TableProfile:
+        """Load the persisted profile of a table, or start an empty one
+
+        Raises ValueError when the persisted key filter was built over a
+        different column than ``key_column``.
+        """
+        path = os.path.join(self.profile_dir, f"{table_name}.json")
+        if not os.path.exists(path):
+            return TableProfile(table_name, key_column, self.key_capacity)
+
+        profile = TableProfile.load(path)
+        if key_column and profile.key_column and profile.key_column != key_column:
+            raise ValueError(f"Profile of {table_name} tracks keys of {profile.key_column}, not {key_column}")
+        if key_column and profile.key_column is None:
+            logger.warning(f"Profile of {table_name} has no key filter yet, starting one over {key_column}")
+            profile.track_keys(key_column, self.key_capacity)
+        return profile
+
+    @profiled
+    def update_profile(self, df: pd.DataFrame, table_name: str, key_column: str = None) -> TableProfile:
+        """Fold loaded rows into the table profile chunk by chunk and persist it
+
+        Call after a successful load so the next run's cross-run duplicate and
+        drift checks see these rows. Raises ValueError when ``key_column`` is
+        missing from ``df``, since the key filter would silently fall behind.
+        """
+        if key_column and key_column not in df.columns:
+            raise ValueError(f"Key column {key_column} missing from rows loaded into {table_name}")
+        profile = self.get_profile(table_name, key_column)
+        for start in range(0, len(df), self.chunk_size):
+            profile.update(df.iloc[start:start + self.chunk_size])
+        profile.save(os.path.join(self.profile_dir, f"{table_name}.json"))
+        logger.info(f"Updated profile of {table_name} with {len(df)} rows")
+        return profile
+
+    @profiled
+    def check_cross_run_duplicates(self, df: pd.DataFrame, table_name: str, key_column: str,
+                                   verify: bool = True) -> Tuple[bool, Dict]:
+        """Check for natural keys already loaded by a previous run
+
+        The table's Bloom filter rules out most keys without touching the
+        warehouse; only the possible matches are looked up when ``verify`` is set.
+        """
+        profile = self.get_profile(table_name, key_column)
+        if profile.keys is None:
+            return True, {'candidate_count': 0, 'duplicate_count': 0}
+
+        keys = df[key_column].dropna()
+        if pd.api.types.is_float_dtype(keys) and (keys == np.floor(keys)).all():
+            # Integer keys upcast to float by a NaN are looked up as integers
+            keys = keys.astype('int64')
+        candidate_mask = np.zeros(len(keys), dtype=bool)
+        for start in range(0, len(keys), self.chunk_size):
+            chunk = keys.iloc[start:start + self.chunk_size]
+            candidate_mask[start:start + len(chunk)] = profile.keys.contains(hash_values(chunk))
+        candidates = keys[candidate_mask].unique().tolist()
+
+        duplicates = candidates
+        if verify and candidates:
+            duplicates = []
+            conn = self.db_conn.get_postgres_connection()
+            try:
+                with conn.cursor() as cur:
+                    for start in range(0, len(candidates), self.chunk_size):
+                        cur.execute(
+                            f"SELECT {key_column} FROM {table_name} WHERE {key_column} = ANY(%s)",
+                            (candidates[start:start + self.chunk_size],)
+                        )
+                        duplicates.extend(row[key_column] for row in cur.fetchall())
+            finally:
+                conn.rollback()
+
+        results = {
+            'candidate_count': len(candidates),
+            'duplicate_count': len(duplicates),
+            'duplicate_keys': duplicates[:100]
+        }
+
+        passed = len(duplicates) == 0
+        if not passed:
+            logger.warning(f"Found {len(duplicates)} {key_column} values already loaded into {table_name}")
+
+        return passed, results
+
+    @profiled
+    def check_distribution_drift(self, df: pd.DataFrame, table_name: str, columns: List[str],
+                                 threshold: float = 0.1) -> Tuple[bool, Dict]:
+        """Check numeric columns against their historical distribution
+
+        Uses the Kolmogorov-Smirnov distance between the persisted quantile
+        sketch and the incoming values; columns without history pass.
+        """
+        profile = self.get_profile(table_name)
+        results = {}
+        passed = True
+
+        for column in columns:
+            history = profile.columns.get(column, {}).get('quantiles')
+            values = pd.to_numeric(df[column], errors='coerce').dropna().to_numpy()
+            if history is None or history.count == 0 or len(values) == 0:
+                results[column] = {'ks_distance': None, 'historical_count': 0}
+                continue
+
+            grid = np.unique(np.concatenate([history.quantiles(np.linspace(0, 1, 101)), values]))
+            current_cdf = np.searchsorted(np.sort(values), grid, side='right') / len(values)
+            ks_distance = float(np.max(np.abs(history.cdf(grid) - current_cdf)))
+
+            results[column] = {
+                'ks_distance': ks_distance,
+                'historical_count': history.count,
+                'historical_median': float(history.quantiles([0.5])[0]),
+                'current_median': float(np.median(values))
+            }
+
+            if ks_distance > threshold:
+                passed = False
+                logger.warning(f"Column {column} drifted from its history (KS distance {ks_distance:.3f})")
+
+        return passed, results
+
+    @profiled
     def check_product_data(self, df: pd.DataFrame) -> bool:
         """Check product data quality"""
         checks_passed = True
@@ -126,6 +259,7 @@ class DataQualityChecker:
         
         return checks_passed
     
+    @profiled
     def check_transaction_data(self, df: pd.DataFrame) -> bool:
         """Check transaction data quality"""
         checks_passed = True
@@ -152,6 +286,7 @@ class DataQualityChecker:
         
         return checks_passed
     
+    @profiled
     def check_store_data(self, df: pd.DataFrame) -> bool:
         """Check store data quality"""
         checks_passed = True
@@ -177,6 +312,7 @@ class DataQualityChecker:
             return False
         return True
     
+    @profiled
     def run_all_checks(self, df: pd.DataFrame, check_config: Dict) -> Dict:
         """Run all configured data quality checks"""
         results = {
@@ -202,4 +338,19 @@ class DataQualityChecker:
             results['checks']['value_ranges'] = check_results
             results['overall_status'] &= passed
         
+        # Cross-run duplicates against previously loaded natural keys
+        if 'natural_key' in check_config:
+            passed, check_results = self.check_cross_run_duplicates(
+                df, check_config['table_name'], check_config['natural_key'])
+            results['checks']['cross_run_duplicates'] = check_results
+            results['overall_status'] &= passed
+        
+        # Distribution drift against the persisted profile
+        if 'drift_columns' in check_config:
+            passed, check_results = self.check_distribution_drift(
+                df, check_config['table_name'], check_config['drift_columns'],
+                check_config.get('drift_threshold', 0.1))
+            results['checks']['distribution_drift'] = check_results
+            results['overall_status'] &= passed
+        
         return results
\ No newline at end of file
@@ -0,0 +1,339 @@
+import os
+import json
+import math
+import base64
+import logging
+from typing import Dict, List, Optional
+import pandas as pd
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+def _canonical_strings(values: pd.Series) -> pd.Series:
+    """Render values so that 123, 123.0 and '123' share one representation"""
+    if pd.api.types.is_bool_dtype(values):
+        return values.astype(str)
+    if pd.api.types.is_integer_dtype(values):
+        return values.astype('int64').astype(str)
+    if pd.api.types.is_float_dtype(values):
+        floats = values.astype('float64')
+        integral = np.isfinite(floats) & (floats == np.floor(floats)) & (floats.abs() < 2 ** 63)
+        rendered = floats.astype(str)
+        rendered[integral] = floats[integral].astype('int64').astype(str)
+        return rendered
+    return values.map(
+        lambda v: str(int(v)) if isinstance(v, float) and v.is_integer() else str(v)
+    )
+
+def hash_values(series: pd.Series) -> np.ndarray:
+    """Hash non-null values to stable 64-bit integers
+
+    Integral floats and nullable integers hash like plain integers, so a key
+    column upcast to float64 by a NaN in one run still matches earlier runs.
+    """
+    values = _canonical_strings(series.dropna())
+    return pd.util.hash_pandas_object(values, index=False).to_numpy(dtype=np.uint64)
+
+def _encode(array: np.ndarray) -> str:
+    return base64.b64encode(array.tobytes()).decode('ascii')
+
+def _decode(data: str, dtype) -> np.ndarray:
+    return np.frombuffer(base64.b64decode(data), dtype=dtype).copy()
+
+class HyperLogLog:
+    """Mergeable distinct-count sketch with a relative error of about 1.04 / sqrt(2 ** precision)"""
+
+    def __init__(self, precision: int = 14, registers: Optional[np.ndarray] = None):
+        self.precision = precision
+        self.registers = registers if registers is not None else np.zeros(1 << precision, dtype=np.uint8)
+
+    def update(self, hashes: np.ndarray) -> None:
+        """Add a batch of 64-bit hashes"""
+        if len(hashes) == 0:
+            return
+        tail_bits = 64 - self.precision
+        index = (hashes >> np.uint64(tail_bits)).astype(np.int64)
+        remainder = hashes & np.uint64((1 << tail_bits) - 1)
+        # frexp gives the bit length exactly since the remainder fits in the float mantissa
+        _, bit_length = np.frexp(remainder.astype(np.float64))
+        rank = (tail_bits - bit_length + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+
+    def merge(self, other: 'HyperLogLog') -> None:
+        """Merge another sketch of the same precision into this one"""
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def estimate(self) -> float:
+        """Estimated number of distinct values"""
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.sum(np.power(2.0, -self.registers.astype(np.float64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and zeros > 0:
+            return m * math.log(m / zeros)
+        return float(raw)
+
+    def to_dict(self) -> Dict:
+        return {'precision': self.precision, 'registers': _encode(self.registers)}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'HyperLogLog':
+        return cls(data['precision'], _decode(data['registers'], np.uint8))
+
+class QuantileSketch:
+    """Mergeable quantile sketch built from compactors (a simplified KLL sketch)
+
+    Each level holds at most ``k`` items of weight ``2 ** level``; when a level
+    overflows it is sorted and every other item is promoted to the next level.
+    """
+
+    def __init__(self, k: int = 200, levels: Optional[List[np.ndarray]] = None, count: int = 0):
+        self.k = k
+        self.levels = levels if levels is not None else [np.empty(0)]
+        self.count = count
+
+    def update(self, values: np.ndarray) -> None:
+        """Add a batch of numeric values, ignoring NaNs"""
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self.count += len(values)
+        self._compress()
+
+    def merge(self, other: 'QuantileSketch') -> None:
+        """Merge another sketch into this one"""
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self.count += other.count
+        self._compress()
+
+    def _compress(self) -> None:
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) > self.k:
+                items = np.sort(items)
+                keep = items[len(items) - len(items) % 2:]
+                offset = (self.count + level) % 2
+                promoted = items[:len(items) - len(items) % 2][offset::2]
+                self.levels[level] = keep
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+            level += 1
+
+    def _weighted_items(self):
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([
+            np.full(len(level_items), 2.0 ** level) for level, level_items in enumerate(self.levels)
+        ])
+        order = np.argsort(items, kind='stable')
+        return items[order], np.cumsum(weights[order])
+
+    def quantiles(self, qs) -> np.ndarray:
+        """Approximate values at the given quantiles in [0, 1]"""
+        items, cumulative = self._weighted_items()
+        if len(items) == 0:
+            return np.full(len(qs), np.nan)
+        ranks = np.asarray(qs, dtype=np.float64) * cumulative[-1]
+        index = np.minimum(np.searchsorted(cumulative, ranks, side='left'), len(items) - 1)
+        return items[index]
+
+    def cdf(self, values) -> np.ndarray:
+        """Approximate fraction of values less than or equal to each of the given values"""
+        items, cumulative = self._weighted_items()
+        if len(items) == 0:
+            return np.full(len(values), np.nan)
+        index = np.searchsorted(items, np.asarray(values, dtype=np.float64), side='right')
+        below = np.where(index > 0, cumulative[np.maximum(index - 1, 0)], 0.0)
+        return below / cumulative[-1]
+
+    def to_dict(self) -> Dict:
+        return {'k': self.k, 'count': self.count, 'levels': [level.tolist() for level in self.levels]}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'QuantileSketch':
+        levels = [np.asarray(level, dtype=np.float64) for level in data['levels']]
+        return cls(data['k'], levels, data['count'])
+
+class BloomFilter:
+    """Bloom filter over 64-bit hashes, using double hashing to derive the bit positions
+
+    Bits are kept packed, eight to a byte, both in memory and on disk.
+    """
+
+    def __init__(self, capacity: int = 1_000_000, error_rate: float = 0.01,
+                 bits: Optional[np.ndarray] = None, count: int = 0):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = int(math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, int(round(self.size / capacity * math.log(2))))
+        self.bits = bits if bits is not None else np.zeros((self.size + 7) // 8, dtype=np.uint8)
+        self.count = count
+
+    @property
+    def is_full(self) -> bool:
+        return self.count >= self.capacity
+
+    def _positions(self, hashes: np.ndarray) -> np.ndarray:
+        h1 = hashes & np.uint64(0xFFFFFFFF)
+        h2 = (hashes >> np.uint64(32)) | np.uint64(1)
+        steps = np.arange(self.hash_count, dtype=np.uint64)
+        return ((h1[:, None] + steps[None, :] * h2[:, None]) % np.uint64(self.size)).astype(np.int64)
+
+    def add(self, hashes: np.ndarray) -> None:
+        """Add a batch of 64-bit hashes"""
+        if len(hashes) == 0:
+            return
+        positions = self._positions(hashes).ravel()
+        np.bitwise_or.at(self.bits, positions >> 3, np.left_shift(1, positions & 7).astype(np.uint8))
+        self.count += len(hashes)
+
+    def contains(self, hashes: np.ndarray) -> np.ndarray:
+        """Return a boolean mask of hashes that may have been added; False is definite"""
+        if len(hashes) == 0:
+            return np.zeros(0, dtype=bool)
+        positions = self._positions(hashes)
+        return ((self.bits[positions >> 3] >> (positions & 7)) & 1).astype(bool).all(axis=1)
+
+    def merge(self, other: 'BloomFilter') -> None:
+        """Merge a filter built with the same capacity and error rate"""
+        np.bitwise_or(self.bits, other.bits, out=self.bits)
+        self.count += other.count
+
+    def to_dict(self) -> Dict:
+        return {
+            'capacity': self.capacity,
+            'error_rate': self.error_rate,
+            'count': self.count,
+            'bits': _encode(self.bits)
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'BloomFilter':
+        return cls(data['capacity'], data['error_rate'], _decode(data['bits'], np.uint8), data['count'])
+
+class ScalableBloomFilter:
+    """Bloom filter that adds a larger, stricter slice whenever the current one is full
+
+    Slice ``i`` holds ``initial_capacity * 2 ** i`` keys at an error rate of
+    ``error_rate / 2 ** (i + 1)``, so the combined false positive rate stays
+    below ``error_rate`` however many keys are loaded.
+    """
+
+    def __init__(self, initial_capacity: int = 1_000_000, error_rate: float = 0.01,
+                 slices: Optional[List[BloomFilter]] = None):
+        self.initial_capacity = initial_capacity
+        self.error_rate = error_rate
+        self.slices = slices if slices is not None else []
+
+    @property
+    def count(self) -> int:
+        return sum(bloom.count for bloom in self.slices)
+
+    def _add_slice(self) -> BloomFilter:
+        level = len(self.slices)
+        bloom = BloomFilter(self.initial_capacity * 2 ** level, self.error_rate / 2 ** (level + 1))
+        self.slices.append(bloom)
+        logger.info(f"Added Bloom filter slice {level} with capacity {bloom.capacity}")
+        return bloom
+
+    def add(self, hashes: np.ndarray) -> None:
+        """Add a batch of 64-bit hashes, skipping keys the filter already reports"""
+        hashes = hashes[~self.contains(hashes)]
+        while len(hashes) > 0:
+            bloom = self.slices[-1] if self.slices and not self.slices[-1].is_full else self._add_slice()
+            room = bloom.capacity - bloom.count
+            bloom.add(hashes[:room])
+            hashes = hashes[room:]
+
+    def contains(self, hashes: np.ndarray) -> np.ndarray:
+        """Return a boolean mask of hashes that may have been added; False is definite"""
+        found = np.zeros(len(hashes), dtype=bool)
+        for bloom in self.slices:
+            found[~found] = bloom.contains(hashes[~found])
+        return found
+
+    def to_dict(self) -> Dict:
+        return {
+            'initial_capacity': self.initial_capacity,
+            'error_rate': self.error_rate,
+            'slices': [bloom.to_dict() for bloom in self.slices]
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'ScalableBloomFilter':
+        return cls(data['initial_capacity'], data['error_rate'],
+                   [BloomFilter.from_dict(bloom) for bloom in data['slices']])
+
+class TableProfile:
+    """Per-table column sketches and natural key filter, persisted across runs"""
+
+    def __init__(self, table_name: str, key_column: Optional[str] = None,
+                 key_capacity: int = 1_000_000):
+        self.table_name = table_name
+        self.key_column = key_column
+        self.row_count = 0
+        self.columns: Dict[str, Dict] = {}
+        self.keys = ScalableBloomFilter(key_capacity) if key_column else None
+
+    def track_keys(self, key_column: str, key_capacity: int = 1_000_000) -> None:
+        """Start a natural key filter over a column; earlier rows are not in it"""
+        self.key_column = key_column
+        self.keys = ScalableBloomFilter(key_capacity)
+
+    def update(self, df: pd.DataFrame) -> None:
+        """Fold a chunk of rows into the sketches"""
+        self.row_count += len(df)
+        for column in df.columns:
+            stats = self.columns.setdefault(column, {'null_count': 0, 'distinct': HyperLogLog()})
+            series = df[column]
+            stats['null_count'] += int(series.isnull().sum())
+            stats['distinct'].update(hash_values(series))
+            if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+                stats.setdefault('quantiles', QuantileSketch()).update(series.to_numpy(dtype=np.float64, na_value=np.nan))
+        if self.keys is not None and self.key_column in df.columns:
+            self.keys.add(hash_values(df[self.key_column]))
+
+    def to_dict(self) -> Dict:
+        return {
+            'table_name': self.table_name,
+            'key_column': self.key_column,
+            'row_count': self.row_count,
+            'keys': self.keys.to_dict() if self.keys is not None else None,
+            'columns': {
+                column: {name: value if name == 'null_count' else value.to_dict()
+                         for name, value in stats.items()}
+                for column, stats in self.columns.items()
+            }
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'TableProfile':
+        profile = cls(data['table_name'])
+        profile.key_column = data['key_column']
+        profile.row_count = data['row_count']
+        profile.keys = ScalableBloomFilter.from_dict(data['keys']) if data['keys'] else None
+        for column, stats in data['columns'].items():
+            profile.columns[column] = {'null_count': stats['null_count'],
+                                       'distinct': HyperLogLog.from_dict(stats['distinct'])}
+            if 'quantiles' in stats:
+                profile.columns[column]['quantiles'] = QuantileSketch.from_dict(stats['quantiles'])
+        return profile
+
+    def save(self, path: str) -> None:
+        """Write the profile atomically so an interrupted run never leaves a partial file"""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.to_dict(), f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'TableProfile':
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
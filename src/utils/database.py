@@ -1,11 +1,6 @@
 import configparser
 import logging
 from typing import Dict, Any
-import psycopg2
-from psycopg2.extras import RealDictCursor
-from pymongo import MongoClient
-import requests
-from sqlalchemy import create_engine
 
 logger = logging.getLogger(__name__)
 
@@ -16,6 +11,7 @@ class DatabaseConnection:
         self.config = self._read_config(config_path)
         self.pg_conn = None
         self.mongo_client = None
+        self.engine = None
         
     def _read_config(self, config_path: str) -> configparser.ConfigParser:
         """Read configuration from the specified file"""
@@ -27,6 +23,8 @@ class DatabaseConnection:
         """Create and return a PostgreSQL connection"""
         try:
             if not self.pg_conn or self.pg_conn.closed:
+                import psycopg2
+                from psycopg2.extras import RealDictCursor
                 params = self.config['postgresql']
                 self.pg_conn = psycopg2.connect(**dict(params.items()),
                                               cursor_factory=RealDictCursor)
@@ -38,8 +36,9 @@ class DatabaseConnection:
     def get_mongo_connection(self):
         """Create and return a MongoDB connection"""
         try:
+            params = self.config['mongodb']
             if not self.mongo_client:
-                params = self.config['mongodb']
+                from pymongo import MongoClient
                 self.mongo_client = MongoClient(params['uri'])
             return self.mongo_client[params['database']]
         except Exception as e:
@@ -49,6 +48,7 @@ class DatabaseConnection:
     def get_api_session(self):
         """Create and return an API session with authentication"""
         try:
+            import requests
             session = requests.Session()
             api_config = self.config['api']
             session.headers.update({
@@ -63,9 +63,12 @@ class DatabaseConnection:
     def get_sqlalchemy_engine(self):
         """Create and return SQLAlchemy engine for PostgreSQL"""
         try:
-            params = self.config['postgresql']
-            url = f"postgresql://{params['user']}:{params['password']}@{params['host']}/{params['database']}"
-            return create_engine(url)
+            if not self.engine:
+                from sqlalchemy import create_engine
+                params = self.config['postgresql']
+                url = f"postgresql://{params['user']}:{params['password']}@{params['host']}/{params['database']}"
+                self.engine = create_engine(url)
+            return self.engine
         except Exception as e:
             logger.error(f"Error creating SQLAlchemy engine: {str(e)}")
             raise
@@ -75,4 +78,6 @@ class DatabaseConnection:
         if self.pg_conn:
             self.pg_conn.close()
         if self.mongo_client:
-            self.mongo_client.close()
\ No newline at end of file
+            self.mongo_client.close()
+        if self.engine:
+            self.engine.dispose()
\ No newline at end of file
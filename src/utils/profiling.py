@@ -0,0 +1,135 @@
+import os
+import time
+import logging
+import functools
+from datetime import datetime
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+PROFILERS = ['cprofile', 'pyinstrument']
+
+_settings = {
+    'enabled': False,
+    'output_dir': None,
+    'profiler': 'cprofile',
+    'top_allocations': 25
+}
+_state = {'active': False, 'calls': {}}
+
+def enable_profiling(output_dir: str = 'logs/profile', profiler: str = 'cprofile',
+                     top_allocations: int = 25) -> str:
+    """Turn on profiling of decorated stages and return the run's report directory"""
+    if profiler not in PROFILERS:
+        raise ValueError(f"Unknown profiler {profiler}, expected one of {PROFILERS}")
+    if profiler == 'pyinstrument':
+        try:
+            import pyinstrument  # noqa: F401
+        except ImportError:
+            logger.warning("pyinstrument is not installed, falling back to cProfile")
+            profiler = 'cprofile'
+
+    run_dir = os.path.join(output_dir, datetime.now().strftime('%Y%m%d_%H%M%S'))
+    os.makedirs(run_dir, exist_ok=True)
+    _settings.update(enabled=True, output_dir=run_dir, profiler=profiler,
+                     top_allocations=top_allocations)
+    _state['calls'] = {}
+    logger.info(f"Profiling enabled with {profiler}, writing reports to {run_dir}")
+    return run_dir
+
+def disable_profiling() -> None:
+    """Turn off profiling of decorated stages"""
+    _settings['enabled'] = False
+
+def profiled(func: Optional[Callable] = None, *, stage: Optional[str] = None):
+    """Decorator that profiles time and memory of a pipeline stage when profiling is enabled
+
+    Usable bare (``@profiled``) or with an explicit report name
+    (``@profiled(stage='load_sales')``). Calls made while another stage is
+    already being profiled are attributed to the outer stage.
+    """
+    def decorator(func: Callable) -> Callable:
+        stage_name = stage or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _settings['enabled'] or _state['active']:
+                return func(*args, **kwargs)
+            _state['active'] = True
+            try:
+                return _run_profiled(stage_name, func, args, kwargs)
+            finally:
+                _state['active'] = False
+        return wrapper
+
+    if func is not None:
+        return decorator(func)
+    return decorator
+
+def _run_profiled(stage_name: str, func: Callable, args, kwargs):
+    """Run a stage under the configured profiler and tracemalloc, then write its reports"""
+    import tracemalloc
+
+    call_number = _state['calls'].get(stage_name, 0) + 1
+    _state['calls'][stage_name] = call_number
+    report_path = os.path.join(_settings['output_dir'], f"{stage_name}_{call_number}")
+
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    profiler = _start_profiler()
+    start = time.perf_counter()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        elapsed = time.perf_counter() - start
+        _stop_profiler(profiler, report_path)
+        snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        if started_tracing:
+            tracemalloc.stop()
+        _write_allocation_report(snapshot, peak, elapsed, stage_name, f"{report_path}_alloc.txt")
+        logger.info(f"Profiled {stage_name}: {elapsed:.3f}s, peak memory {peak / 1024 / 1024:.1f} MiB")
+
+def _start_profiler():
+    """Start the configured profiler"""
+    if _settings['profiler'] == 'pyinstrument':
+        from pyinstrument import Profiler
+        profiler = Profiler()
+        profiler.start()
+    else:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+    return profiler
+
+def _stop_profiler(profiler, report_path: str) -> None:
+    """Stop the profiler and write its report"""
+    if _settings['profiler'] == 'pyinstrument':
+        profiler.stop()
+        with open(f"{report_path}.txt", 'w') as f:
+            f.write(profiler.output_text(unicode=False, color=False))
+    else:
+        profiler.disable()
+        profiler.dump_stats(f"{report_path}.pstats")
+
+def _write_allocation_report(snapshot, peak: int, elapsed: float, stage_name: str, path: str) -> None:
+    """Write the top allocation sites of a stage"""
+    snapshot = snapshot.filter_traces(_allocation_filters())
+    stats = snapshot.statistics('lineno')[:_settings['top_allocations']]
+    with open(path, 'w') as f:
+        f.write(f"stage: {stage_name}\n")
+        f.write(f"elapsed_seconds: {elapsed:.3f}\n")
+        f.write(f"peak_memory_bytes: {peak}\n\n")
+        for stat in stats:
+            f.write(f"{stat}\n")
+
+def _allocation_filters():
+    """Exclude allocations made by the profiling machinery itself"""
+    import tracemalloc
+    return [
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, __file__),
+        tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+    ]
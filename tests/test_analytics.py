@@ -0,0 +1,183 @@
+import os
+import pytest
+import pandas as pd
+from datetime import datetime
+from src.analytics.query_runner import AnalyticsQueryRunner
+from src.utils.database import DatabaseConnection
+
+@pytest.fixture
+def report_dir(tmp_path):
+    sql_dir = tmp_path / 'sql'
+    sql_dir.mkdir()
+    (sql_dir / 'sales_report.sql').write_text(
+        "SELECT st.region, SUM(s.total_amount) as total_revenue\n"
+        "FROM fact_sales s\n"
+        "JOIN dim_store st ON s.store_id = st.store_id\n"
+        "WHERE (%(region)s IS NULL OR st.region = %(region)s)\n"
+        "GROUP BY st.region"
+    )
+    return tmp_path
+
+@pytest.fixture
+def db_connection(mocker, report_dir):
+    mock_conn = mocker.Mock(spec=DatabaseConnection)
+    mock_conn.config = {'analytics': {
+        'sql_dir': str(report_dir / 'sql'),
+        'cache_dir': str(report_dir / 'cache'),
+        'max_cache_mb': '1'
+    }}
+    return mock_conn
+
+@pytest.fixture
+def runner(db_connection, mocker):
+    runner = AnalyticsQueryRunner(db_connection)
+    mocker.patch.object(runner, 'get_watermarks', return_value={'fact_sales': '2024-01-01T00:00:00'})
+    return runner
+
+@pytest.fixture
+def report_result():
+    return pd.DataFrame({'region': ['West'], 'total_revenue': [100.0]})
+
+class TestAnalyticsQueryRunner:
+    def test_get_source_tables(self, runner):
+        # Arrange
+        sql = "WITH m AS (SELECT * FROM dim_store st LEFT JOIN fact_sales s ON 1=1) SELECT * FROM m"
+
+        # Act
+        result = runner.get_source_tables(sql)
+
+        # Assert
+        assert result == ['dim_store', 'fact_sales']
+
+    def test_get_watermarks_releases_connection(self, db_connection, mocker):
+        # Arrange
+        mock_engine = mocker.MagicMock()
+        mock_conn = mock_engine.connect.return_value.__enter__.return_value
+        mock_conn.execute.return_value = [('fact_sales', datetime(2024, 1, 1))]
+        db_connection.get_sqlalchemy_engine.return_value = mock_engine
+        runner = AnalyticsQueryRunner(db_connection)
+
+        # Act
+        result = runner.get_watermarks(['dim_store', 'fact_sales'])
+
+        # Assert
+        assert result == {'dim_store': None, 'fact_sales': '2024-01-01T00:00:00'}
+        mock_engine.connect.return_value.__exit__.assert_called_once()
+        db_connection.get_postgres_connection.assert_not_called()
+
+    def test_run_report_serves_cache(self, runner, report_result, mocker):
+        # Arrange
+        mock_read_sql = mocker.patch('pandas.read_sql', return_value=report_result)
+
+        # Act
+        first = runner.run_report('sales_report', {'region': 'West'})
+        second = runner.run_report('sales_report', {'region': 'West'})
+
+        # Assert
+        mock_read_sql.assert_called_once()
+        assert mock_read_sql.call_args.kwargs['params'] == {'region': 'West'}
+        pd.testing.assert_frame_equal(first, second)
+
+    def test_run_report_invalidated_by_watermark(self, runner, report_result, mocker):
+        # Arrange
+        mock_read_sql = mocker.patch('pandas.read_sql', return_value=report_result)
+        runner.run_report('sales_report')
+
+        # Act
+        runner.get_watermarks.return_value = {'fact_sales': '2024-01-02T00:00:00'}
+        runner.run_report('sales_report')
+
+        # Assert
+        assert mock_read_sql.call_count == 2
+        assert len(os.listdir(runner.cache_dir)) == 1
+
+    def test_run_report_prefers_params_variant(self, runner, report_dir, report_result, mocker):
+        # Arrange
+        (report_dir / 'sql' / 'plain_report.sql').write_text("SELECT * FROM fact_sales")
+        (report_dir / 'sql' / 'params').mkdir()
+        (report_dir / 'sql' / 'params' / 'plain_report.sql').write_text(
+            "SELECT * FROM fact_sales s WHERE (%(region)s IS NULL OR s.region = %(region)s)"
+        )
+        mock_read_sql = mocker.patch('pandas.read_sql', return_value=report_result)
+
+        # Act
+        runner.run_report('plain_report', {'region': 'West'})
+
+        # Assert
+        assert '%(region)s' in mock_read_sql.call_args.args[0]
+        assert mock_read_sql.call_args.kwargs['params'] == {'region': 'West'}
+
+    def test_run_report_date_dependent_expires_daily(self, runner, report_dir, report_result, mocker):
+        # Arrange
+        (report_dir / 'sql' / 'recency_report.sql').write_text(
+            "SELECT CURRENT_DATE - MAX(d.full_date) AS days_since FROM fact_sales s JOIN dim_date d ON 1=1"
+        )
+        mock_read_sql = mocker.patch('pandas.read_sql', return_value=report_result)
+        mocker.patch.object(runner, '_today', return_value='2024-01-01')
+        runner.run_report('recency_report')
+        runner.run_report('recency_report')
+
+        # Act
+        runner._today.return_value = '2024-01-02'
+        runner.run_report('recency_report')
+
+        # Assert
+        assert mock_read_sql.call_count == 2
+        assert len(os.listdir(runner.cache_dir)) == 1
+
+    def test_run_report_recovers_from_corrupt_entry(self, runner, report_result, mocker):
+        # Arrange
+        mock_read_sql = mocker.patch('pandas.read_sql', return_value=report_result)
+        runner.run_report('sales_report')
+        [entry] = os.listdir(runner.cache_dir)
+        with open(os.path.join(runner.cache_dir, entry), 'wb') as f:
+            f.write(b'PAR1 truncated')
+
+        # Act
+        first = runner.run_report('sales_report')
+        second = runner.run_report('sales_report')
+
+        # Assert
+        assert mock_read_sql.call_count == 2
+        pd.testing.assert_frame_equal(first, report_result)
+        pd.testing.assert_frame_equal(second, report_result)
+
+    def test_run_report_writes_cache_atomically(self, runner, report_result, mocker):
+        # Arrange
+        mocker.patch('pandas.read_sql', return_value=report_result)
+        def partial_write(path, **kwargs):
+            with open(path, 'wb') as f:
+                f.write(b'PAR1 partial')
+            raise OSError('disk full')
+        mocker.patch.object(pd.DataFrame, 'to_parquet', side_effect=partial_write)
+
+        # Act
+        with pytest.raises(OSError):
+            runner.run_report('sales_report')
+
+        # Assert
+        assert os.listdir(runner.cache_dir) == []
+
+    def test_read_cached_missing_entry(self, runner):
+        # Act
+        result = runner._read_cached(os.path.join(runner.cache_dir, 'evicted.parquet'))
+
+        # Assert
+        assert result is None
+
+    def test_run_report_rejects_unknown_params(self, runner):
+        with pytest.raises(ValueError):
+            runner.run_report('sales_report', {'store_type': 'Mall'})
+
+    def test_evict_least_recently_used(self, runner, report_result):
+        # Arrange
+        runner.max_cache_bytes = 0
+        old_entry = os.path.join(runner.cache_dir, 'old-entry.parquet')
+        report_result.to_parquet(old_entry)
+        os.utime(old_entry, (0, 0))
+
+        # Act
+        runner._evict()
+
+        # Assert
+        assert not os.path.exists(old_entry)
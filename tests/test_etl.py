@@ -1,13 +1,19 @@
 # test_etl.py
+import os
+import sys
+import logging
 import pytest
 import pandas as pd
 import numpy as np
 from datetime import datetime
-from src.etl.extractors import DataExtractor
+from src.etl.extractor import DataExtractor
 from src.etl.transformers import DataTransformer
 from src.etl.loaders import DataLoader
 from src.etl.pipeline import ETLPipeline
 from src.utils.database import DatabaseConnection
+from src.utils.profiling import disable_profiling
+from src.quality.checks import DataQualityChecker
+from src import main as etl_main
 
 @pytest.fixture
 def sample_sales_data():
@@ -110,21 +116,59 @@ class TestDataTransformer:
 class TestDataLoader:
     def test_load_to_warehouse(self, db_connection, sample_sales_data, mocker):
         # Arrange
-        mock_engine = mocker.Mock()
+        mock_engine = mocker.MagicMock()
+        mock_conn = mock_engine.begin.return_value.__enter__.return_value
         db_connection.get_sqlalchemy_engine.return_value = mock_engine
+        mock_to_sql = mocker.patch.object(pd.DataFrame, 'to_sql')
         loader = DataLoader(db_connection)
 
         # Act
         loader.load_to_warehouse(sample_sales_data, 'test_table')
 
         # Assert
-        sample_sales_data.to_sql.assert_called_once_with(
+        mock_to_sql.assert_called_once_with(
             name='test_table',
-            con=mock_engine,
+            con=mock_conn,
             if_exists='append',
             index=False,
             chunksize=1000
         )
+        mock_engine.begin.assert_called_once()
+
+    def test_load_to_warehouse_updates_watermark(self, db_connection, sample_sales_data, mocker):
+        # Arrange
+        mock_engine = mocker.MagicMock()
+        mock_conn = mock_engine.begin.return_value.__enter__.return_value
+        db_connection.get_sqlalchemy_engine.return_value = mock_engine
+        mocker.patch.object(pd.DataFrame, 'to_sql')
+        loader = DataLoader(db_connection)
+
+        # Act
+        loader.load_to_warehouse(sample_sales_data, 'fact_sales')
+        loader.load_to_warehouse(sample_sales_data, 'fact_sales')
+
+        # Assert
+        statements = [str(call.args[0]) for call in mock_conn.execute.call_args_list]
+        assert sum('CREATE TABLE IF NOT EXISTS etl_watermark' in sql for sql in statements) == 1
+        assert sum('INSERT INTO etl_watermark' in sql for sql in statements) == 2
+        assert mock_conn.execute.call_args.args[1] == {'table_name': 'fact_sales', 'rows_loaded': 3}
+
+    def test_load_to_warehouse_rolls_back_with_watermark(self, db_connection, sample_sales_data, mocker):
+        # Arrange
+        mock_engine = mocker.MagicMock()
+        mock_conn = mock_engine.begin.return_value.__enter__.return_value
+        mock_conn.execute.side_effect = Exception('relation etl_watermark does not exist')
+        db_connection.get_sqlalchemy_engine.return_value = mock_engine
+        mocker.patch.object(pd.DataFrame, 'to_sql')
+        loader = DataLoader(db_connection)
+
+        # Act
+        with pytest.raises(Exception):
+            loader.load_to_warehouse(sample_sales_data, 'fact_sales')
+
+        # Assert
+        exit_args = mock_engine.begin.return_value.__exit__.call_args.args
+        assert exit_args[0] is Exception
 
 class TestETLPipeline:
     def test_run_customer_pipeline(self, db_connection, sample_customer_data, mocker):
@@ -132,6 +176,7 @@ class TestETLPipeline:
         pipeline = ETLPipeline()
         mocker.patch.object(pipeline.extractor, 'extract_from_mongodb', return_value=sample_customer_data)
         mocker.patch.object(pipeline.loader, 'load_to_warehouse')
+        mocker.patch.object(pipeline.quality_checker, 'update_profile')
 
         # Act
         pipeline.run_customer_pipeline()
@@ -139,12 +184,15 @@ class TestETLPipeline:
         # Assert
         pipeline.extractor.extract_from_mongodb.assert_called_once_with('customers')
         pipeline.loader.load_to_warehouse.assert_called_once()
+        pipeline.quality_checker.update_profile.assert_called_once_with(
+            mocker.ANY, 'dim_customer', key_column='customer_id')
 
     def test_run_sales_pipeline(self, db_connection, sample_sales_data, mocker):
         # Arrange
         pipeline = ETLPipeline()
         mocker.patch.object(pipeline.extractor, 'extract_from_api', return_value=sample_sales_data)
         mocker.patch.object(pipeline.loader, 'load_to_warehouse')
+        mocker.patch.object(pipeline.quality_checker, 'update_profile')
 
         # Act
         pipeline.run_sales_pipeline()
@@ -152,4 +200,86 @@ class TestETLPipeline:
         # Assert
         pipeline.extractor.extract_from_api.assert_called_once_with('sales')
         pipeline.loader.load_to_warehouse.assert_called_once()
+        pipeline.quality_checker.update_profile.assert_called_once_with(
+            mocker.ANY, 'fact_sales', key_column='transaction_key')
+
+    def test_run_sales_pipeline_keeps_load_when_profile_fails(self, sample_sales_data, mocker):
+        # Arrange
+        pipeline = ETLPipeline()
+        mocker.patch.object(pipeline.extractor, 'extract_from_api', return_value=sample_sales_data)
+        mocker.patch.object(pipeline.loader, 'load_to_warehouse')
+        mocker.patch.object(pipeline.quality_checker, 'update_profile', side_effect=OSError('disk full'))
+
+        # Act
+        pipeline.run_sales_pipeline()
+
+        # Assert
+        pipeline.loader.load_to_warehouse.assert_called_once()
+        pipeline.quality_checker.update_profile.assert_called_once()
+
+    def test_run_sales_pipeline_profiles_loaded_keys(self, sample_sales_data, tmp_path, mocker):
+        # Arrange
+        pipeline = ETLPipeline()
+        pipeline._quality_checker = DataQualityChecker(pipeline.db_conn, profile_dir=str(tmp_path))
+        sales_data = sample_sales_data.assign(transaction_key=['TX1', 'TX2', 'TX3'])
+        mocker.patch.object(pipeline.extractor, 'extract_from_api', return_value=sales_data)
+        mocker.patch.object(pipeline.loader, 'load_to_warehouse')
+
+        # Act
+        pipeline.run_sales_pipeline()
+
+        # Assert
+        profile = pipeline.quality_checker.get_profile('fact_sales', 'transaction_key')
+        assert profile.row_count == 3
+        assert profile.keys.count == 3
+
+    def test_run_sales_pipeline_without_key_column_writes_no_profile(self, sample_sales_data, tmp_path, mocker):
+        # Arrange
+        pipeline = ETLPipeline()
+        pipeline._quality_checker = DataQualityChecker(pipeline.db_conn, profile_dir=str(tmp_path))
+        mocker.patch.object(pipeline.extractor, 'extract_from_api', return_value=sample_sales_data)
+        mocker.patch.object(pipeline.loader, 'load_to_warehouse')
+
+        # Act
+        pipeline.run_sales_pipeline()
+
+        # Assert
+        pipeline.loader.load_to_warehouse.assert_called_once()
+        assert not (tmp_path / 'fact_sales.json').exists()
+
+    def test_run_sales_pipeline_skips_profile_on_failed_load(self, sample_sales_data, mocker):
+        # Arrange
+        pipeline = ETLPipeline()
+        mocker.patch.object(pipeline.extractor, 'extract_from_api', return_value=sample_sales_data)
+        mocker.patch.object(pipeline.loader, 'load_to_warehouse', side_effect=Exception('load failed'))
+        mocker.patch.object(pipeline.quality_checker, 'update_profile')
+
+        # Act
+        with pytest.raises(Exception):
+            pipeline.run_sales_pipeline()
 
+        # Assert
+        pipeline.quality_checker.update_profile.assert_not_called()
+
+class TestMain:
+    def test_profile_flag_writes_stage_reports(self, sample_sales_data, tmp_path, mocker, monkeypatch):
+        # Arrange
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr(sys, 'argv', ['main.py', '--pipeline', 'sales', '--profile'])
+        mocker.patch.object(etl_main, 'setup_logging', return_value=logging.getLogger('test_main'))
+        mocker.patch.object(DataExtractor, 'extract_from_api', return_value=sample_sales_data)
+        mocker.patch.object(DataLoader, 'load_to_warehouse')
+        mocker.patch.object(DataQualityChecker, 'update_profile')
+
+        # Act
+        try:
+            etl_main.main()
+        finally:
+            disable_profiling()
+
+        # Assert
+        run_dirs = os.listdir(tmp_path / 'logs' / 'profile')
+        assert len(run_dirs) == 1
+        reports = os.listdir(tmp_path / 'logs' / 'profile' / run_dirs[0])
+        assert 'DataTransformer.transform_sales_data_1.pstats' in reports
+        assert 'DataTransformer.transform_sales_data_1_alloc.txt' in reports
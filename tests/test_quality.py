@@ -0,0 +1,147 @@
+import pytest
+import pandas as pd
+import numpy as np
+from src.quality.checks import DataQualityChecker
+from src.quality.sketches import HyperLogLog, QuantileSketch, BloomFilter, ScalableBloomFilter, hash_values
+from src.utils.database import DatabaseConnection
+
+@pytest.fixture
+def db_connection(mocker):
+    mock_conn = mocker.Mock(spec=DatabaseConnection)
+    mock_conn.get_postgres_connection.return_value = mocker.MagicMock()
+    return mock_conn
+
+@pytest.fixture
+def quality_checker(db_connection, tmp_path):
+    return DataQualityChecker(db_connection, profile_dir=str(tmp_path), chunk_size=100)
+
+@pytest.fixture
+def loaded_sales_data():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        'transaction_key': [f"TX{i}" for i in range(1000)],
+        'quantity': rng.integers(1, 10, size=1000),
+        'unit_price': rng.normal(20.0, 2.0, size=1000)
+    })
+
+class TestSketches:
+    def test_hyperloglog_estimate(self):
+        # Arrange
+        sketch = HyperLogLog()
+
+        # Act
+        sketch.update(hash_values(pd.Series(np.arange(50000))))
+        sketch.update(hash_values(pd.Series(np.arange(50000))))
+
+        # Assert
+        assert abs(sketch.estimate() - 50000) / 50000 < 0.05
+
+    def test_quantile_sketch_merge(self):
+        # Arrange
+        left, right = QuantileSketch(), QuantileSketch()
+        left.update(np.arange(0, 5000))
+        right.update(np.arange(5000, 10000))
+
+        # Act
+        left.merge(right)
+
+        # Assert
+        assert left.count == 10000
+        assert abs(left.quantiles([0.5])[0] - 5000) < 500
+
+    def test_bloom_filter_round_trip(self):
+        # Arrange
+        bloom = BloomFilter(capacity=1000)
+        hashes = hash_values(pd.Series(range(500)))
+        bloom.add(hashes)
+
+        # Act
+        restored = BloomFilter.from_dict(bloom.to_dict())
+
+        # Assert
+        assert restored.contains(hashes).all()
+
+    def test_scalable_bloom_filter_grows_past_capacity(self):
+        # Arrange
+        bloom = ScalableBloomFilter(initial_capacity=100, error_rate=0.01)
+        loaded = hash_values(pd.Series([f"TX{i}" for i in range(1000)]))
+        unseen = hash_values(pd.Series([f"NEW{i}" for i in range(10000)]))
+
+        # Act
+        bloom.add(loaded)
+        restored = ScalableBloomFilter.from_dict(bloom.to_dict())
+
+        # Assert
+        assert len(bloom.slices) > 1
+        assert restored.contains(loaded).all()
+        assert restored.contains(unseen).mean() < 0.02
+        assert all(s.bits.dtype == np.uint8 and len(s.bits) == (s.size + 7) // 8 for s in bloom.slices)
+
+class TestDataQualityChecker:
+    def test_check_cross_run_duplicates(self, quality_checker, loaded_sales_data, db_connection):
+        # Arrange
+        quality_checker.update_profile(loaded_sales_data, 'fact_sales', key_column='transaction_key')
+        incoming = pd.DataFrame({'transaction_key': ['TX1', 'TX2', 'NEW1']})
+        cursor = db_connection.get_postgres_connection.return_value.cursor.return_value.__enter__.return_value
+        cursor.fetchall.return_value = [{'transaction_key': 'TX1'}, {'transaction_key': 'TX2'}]
+
+        # Act
+        passed, results = quality_checker.check_cross_run_duplicates(incoming, 'fact_sales', 'transaction_key')
+
+        # Assert
+        assert not passed
+        assert results['duplicate_count'] == 2
+        assert 'NEW1' not in cursor.execute.call_args.args[1][0]
+
+    def test_check_cross_run_duplicates_float_keys(self, quality_checker, db_connection):
+        # Arrange
+        quality_checker.update_profile(pd.DataFrame({'customer_id': [1, 2, 3]}), 'dim_customer', 'customer_id')
+        incoming = pd.DataFrame({'customer_id': [2.0, np.nan, 4.0]})
+        cursor = db_connection.get_postgres_connection.return_value.cursor.return_value.__enter__.return_value
+        cursor.fetchall.return_value = [{'customer_id': 2}]
+
+        # Act
+        passed, results = quality_checker.check_cross_run_duplicates(incoming, 'dim_customer', 'customer_id')
+
+        # Assert
+        assert not passed
+        assert results['candidate_count'] == 1
+        assert cursor.execute.call_args.args[1][0] == [2]
+
+    def test_update_profile_requires_key_column(self, quality_checker, loaded_sales_data, tmp_path):
+        # Act / Assert
+        with pytest.raises(ValueError):
+            quality_checker.update_profile(loaded_sales_data.drop(columns=['transaction_key']),
+                                           'fact_sales', key_column='transaction_key')
+        assert not (tmp_path / 'fact_sales.json').exists()
+
+    def test_get_profile_rejects_other_key_column(self, quality_checker, loaded_sales_data):
+        # Arrange
+        quality_checker.update_profile(loaded_sales_data, 'fact_sales', key_column='transaction_key')
+
+        # Act / Assert
+        with pytest.raises(ValueError):
+            quality_checker.get_profile('fact_sales', 'quantity')
+
+    def test_check_cross_run_duplicates_without_history(self, quality_checker, db_connection):
+        # Act
+        passed, results = quality_checker.check_cross_run_duplicates(
+            pd.DataFrame({'transaction_key': ['TX1']}), 'fact_sales', 'transaction_key')
+
+        # Assert
+        assert passed
+        db_connection.get_postgres_connection.assert_not_called()
+
+    def test_check_distribution_drift(self, quality_checker, loaded_sales_data):
+        # Arrange
+        quality_checker.update_profile(loaded_sales_data, 'fact_sales', key_column='transaction_key')
+        shifted = loaded_sales_data.assign(unit_price=loaded_sales_data['unit_price'] + 10)
+
+        # Act
+        stable_passed, _ = quality_checker.check_distribution_drift(loaded_sales_data, 'fact_sales', ['unit_price'])
+        drift_passed, results = quality_checker.check_distribution_drift(shifted, 'fact_sales', ['unit_price'])
+
+        # Assert
+        assert stable_passed
+        assert not drift_passed
+        assert results['unit_price']['ks_distance'] > 0.5
@@ -0,0 +1,48 @@
+import os
+import sys
+import shutil
+import subprocess
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAIN_PATH = os.path.join(REPO_ROOT, 'src', 'main.py')
+HEAVY_MODULES = ('pandas', 'numpy', 'pymongo', 'requests', 'sqlalchemy', 'psycopg2')
+
+class TestStartup:
+    def test_main_store_pipeline_does_not_import_heavy_modules(self, tmp_path):
+        # Arrange
+        shutil.copytree(os.path.join(REPO_ROOT, 'config'), tmp_path / 'config')
+        (tmp_path / 'logs').mkdir()
+        snippet = (
+            "import runpy, sys\n"
+            f"sys.argv = [{MAIN_PATH!r}, '--pipeline', 'store']\n"
+            "try:\n"
+            f"    runpy.run_path({MAIN_PATH!r}, run_name='__main__')\n"
+            "except SystemExit as e:\n"
+            "    print('exit', e.code)\n"
+            f"print('heavy:' + ','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+        )
+
+        # Act
+        result = subprocess.run([sys.executable, '-c', snippet], cwd=tmp_path,
+                                capture_output=True, text=True, check=True)
+
+        # Assert
+        assert 'exit' not in result.stdout
+        assert 'ETL process completed successfully' in result.stdout
+        assert result.stdout.strip().splitlines()[-1] == 'heavy:'
+
+    def test_main_runs_as_script_and_module(self, tmp_path):
+        # Arrange
+        shutil.copytree(os.path.join(REPO_ROOT, 'config'), tmp_path / 'config')
+        (tmp_path / 'logs').mkdir()
+        env = dict(os.environ, PYTHONPATH=REPO_ROOT)
+
+        # Act
+        as_script = subprocess.run([sys.executable, MAIN_PATH, '--pipeline', 'store'],
+                                   cwd=tmp_path, capture_output=True, text=True)
+        as_module = subprocess.run([sys.executable, '-m', 'src.main', '--pipeline', 'store'],
+                                   cwd=tmp_path, env=env, capture_output=True, text=True)
+
+        # Assert
+        assert as_script.returncode == 0, as_script.stderr
+        assert as_module.returncode == 0, as_module.stderr
@@ -1,5 +1,7 @@
 import pytest
+import os
 from src.utils.database import DatabaseConnection
+from src.utils.profiling import profiled, enable_profiling, disable_profiling
 import configparser
 
 class TestDatabaseConnection:
@@ -67,4 +69,35 @@ class TestDatabaseConnection:
 
         # Assert
         mock_create_engine.assert_called_once()
-        assert engine == mock_create_engine.return_value
\ No newline at end of file
+        assert engine == mock_create_engine.return_value
+
+@profiled(stage='sample_stage')
+def sample_stage(size):
+    return [i * 2 for i in range(size)]
+
+class TestProfiling:
+    def test_profiled_writes_reports(self, tmp_path):
+        # Arrange
+        run_dir = enable_profiling(str(tmp_path))
+
+        # Act
+        try:
+            result = sample_stage(1000)
+        finally:
+            disable_profiling()
+
+        # Assert
+        assert len(result) == 1000
+        assert sorted(os.listdir(run_dir)) == ['sample_stage_1.pstats', 'sample_stage_1_alloc.txt']
+
+    def test_profiled_disabled_is_passthrough(self, tmp_path):
+        # Arrange
+        run_dir = enable_profiling(str(tmp_path))
+        disable_profiling()
+
+        # Act
+        result = sample_stage(10)
+
+        # Assert
+        assert result == [i * 2 for i in range(10)]
+        assert os.listdir(run_dir) == []